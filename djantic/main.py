@@ -1,10 +1,10 @@
 from functools import reduce
 from itertools import chain
-from typing import Any, Dict, List, Optional, no_type_check
+from typing import Any, Dict, List, Optional, Tuple, no_type_check
 
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import Manager, Model
-from django.db.models.fields.files import ImageFieldFile
+from django.db.models import Manager, Model, QuerySet
+from django.db.models.fields.files import FileField, ImageFieldFile
 from django.db.models.fields.reverse_related import (ForeignObjectRel,
                                                      OneToOneRel)
 from django.utils.encoding import force_str
@@ -34,6 +34,109 @@ def get_field_name(field) -> str:
         return getattr(field, "name", field)
 
 
+def get_related_lookup(model, path: Tuple[str, ...]) -> Optional[str]:
+    """
+    Return the `select_related` lookup for the single-valued relations that lead
+    to the last name in a double underscore alias path, if any.
+    """
+    related = []
+    for name in path[:-1]:
+        # Match field names only, as `get_field` also accepts the `attname` of a key
+        field = {field.name: field for field in model._meta.get_fields()}.get(name)
+        if (
+            field is None
+            or not (field.many_to_one or field.one_to_one)
+            or field.related_model is None
+        ):
+            break
+        related.append(name)
+        model = field.related_model
+    return "__".join(related) or None
+
+
+def get_related_schema(python_type) -> Optional[type]:
+    """
+    Return the `ModelSchema` nested in a field annotation, e.g. `List[ThreadSchema]`.
+    """
+    if isinstance(python_type, type) and issubclass(python_type, ModelSchema):
+        return python_type
+    for arg in getattr(python_type, "__args__", ()):
+        related_schema = get_related_schema(arg)
+        if related_schema is not None:
+            return related_schema
+    return None
+
+
+def get_select_lookups(field, field_name: str, python_type) -> List[str]:
+    """
+    Return the `select_related` lookups for a single-valued relation to a nested
+    schema, including those declared by the nested schema.
+    """
+    if (
+        isinstance(field, str)
+        or not (field.many_to_one or field.one_to_one)
+        or field.related_model is None
+    ):
+        return []
+    related_schema = get_related_schema(python_type)
+    if related_schema is None:
+        return []
+    return [field_name] + [
+        f"{field_name}__{lookup}" for lookup in related_schema.__select_related__
+    ]
+
+
+def get_prefetch_lookups(field, field_name: str, python_type) -> List[str]:
+    """
+    Return the `prefetch_related` lookups for the many-valued relations reached
+    through a schema field, including those declared by a nested schema.
+    """
+    if isinstance(field, str) or not field.is_relation or field.related_model is None:
+        return []
+    if isinstance(field, ForeignObjectRel) and field.get_accessor_name() != field_name:
+        # Reverse relations named after `related_query_name` are not model attributes
+        return []
+    lookups = []
+    related_schema = get_related_schema(python_type)
+    if field.one_to_many or field.many_to_many:
+        lookups.append(field_name)
+        if related_schema is not None:
+            # Single-valued relations of the related objects are prefetched as well
+            lookups.extend(
+                f"{field_name}__{lookup}"
+                for lookup in related_schema.__select_related__
+            )
+    if related_schema is not None:
+        lookups.extend(
+            f"{field_name}__{lookup}" for lookup in related_schema.__prefetch_related__
+        )
+    return lookups
+
+
+def get_loaded_lookup(queryset: QuerySet, lookup: str) -> Optional[str]:
+    """
+    Return the part of a `select_related` lookup that comes before the first field
+    left unloaded by the `defer` or `only` of a queryset, if any.
+    """
+    field_names, defer = queryset.query.deferred_loading
+    names = lookup.split("__")
+    for index, name in enumerate(names):
+        if defer:
+            is_deferred = "__".join(names[: index + 1]) in field_names
+        else:
+            # Only the models named in the lookups given to `only` are restricted
+            prefix = "".join(f"{parent}__" for parent in names[:index])
+            loaded_names = {
+                field_name[len(prefix):].split("__", 1)[0]
+                for field_name in field_names
+                if field_name.startswith(prefix)
+            }
+            is_deferred = bool(loaded_names) and name not in loaded_names
+        if is_deferred:
+            return "__".join(names[:index]) or None
+    return lookup
+
+
 class ModelSchemaMetaclass(ModelMetaclass):
     @no_type_check
     def __new__(
@@ -83,6 +186,10 @@ class ModelSchemaMetaclass(ModelMetaclass):
                     cls.__config__.include = include
 
                 field_values = {}
+                scalar_fields = set()
+                attname_map = {}
+                select_lookups = []
+                prefetch_lookups = []
                 _seen = set()
 
                 for field in chain(fields, annotations.copy()):
@@ -117,13 +224,45 @@ class ModelSchemaMetaclass(ModelMetaclass):
 
                     else:
                         python_type, pydantic_field = ModelSchemaField(field, name)
+                        if (
+                            field.concrete
+                            and (field.many_to_one or field.one_to_one)
+                            and field.target_field.primary_key
+                        ):
+                            attname_map[field_name] = field.attname
 
                     field_values[field_name] = (python_type, pydantic_field)
+                    if not getattr(pydantic_field, "alias", None):
+                        if (
+                            not isinstance(field, str)
+                            and not field.is_relation
+                            and not isinstance(field, FileField)
+                        ):
+                            scalar_fields.add(field_name)
+                        select_lookups.extend(
+                            get_select_lookups(field, field_name, python_type)
+                        )
+                        prefetch_lookups.extend(
+                            get_prefetch_lookups(field, field_name, python_type)
+                        )
 
                 cls.__doc__ = namespace.get("__doc__", config.model.__doc__)
                 cls.__fields__ = {}
                 cls.__alias_map__ = {getattr(model_field[1], 'alias', None) or field_name: field_name
                                      for field_name, model_field in field_values.items()}
+                cls.__scalar_fields__ = frozenset(scalar_fields)
+                cls.__attname_map__ = attname_map
+                cls.__alias_paths__ = {
+                    alias: tuple(alias.split("__"))
+                    for alias in cls.__alias_map__
+                    if "__" in alias
+                }
+                for path in cls.__alias_paths__.values():
+                    related_lookup = get_related_lookup(config.model, path)
+                    if related_lookup:
+                        select_lookups.append(related_lookup)
+                cls.__select_related__ = tuple(dict.fromkeys(select_lookups))
+                cls.__prefetch_related__ = tuple(dict.fromkeys(prefetch_lookups))
                 model_schema = create_model(
                     name, __base__=cls, __module__=cls.__module__, **field_values
                 )
@@ -139,19 +278,33 @@ class ProxyGetterNestedObj(GetterDict):
         self.schema_class = schema_class
 
     def get(self, key: Any, default: Any = None) -> Any:
+        if key in self.schema_class.__scalar_fields__:
+            # Plain model fields need none of the relation handling below
+            return getattr(self._obj, key, None)
+
         alias = self.schema_class.__alias_map__[key]
+        attname = self.schema_class.__attname_map__.get(alias)
+        if attname is not None:
+            # Read the stored key of a relation rather than loading the related object
+            return getattr(self._obj, attname, None)
+
         outer_type_ = self.schema_class.__fields__[alias].outer_type_
-        if "__" in key:
+        alias_path = self.schema_class.__alias_paths__.get(key)
+        if alias_path:
             # Allow double underscores aliases: `first_name: str = Field(alias="user__first_name")`
-            keys_map = key.split("__")
-            attr = reduce(lambda a, b: getattr(a, b, default), keys_map, self._obj)
+            attr = reduce(lambda a, b: getattr(a, b, default), alias_path, self._obj)
         else:
             attr = getattr(self._obj, key, None)
 
         is_manager = issubclass(attr.__class__, Manager)
 
         if is_manager and outer_type_ == List[Dict[str, int]]:
-            attr = list(attr.all().values("id"))
+            queryset = attr.all()
+            if queryset._result_cache is not None:
+                # Relation was prefetched, avoid issuing another query
+                attr = [{"id": related_obj.pk} for related_obj in queryset]
+            else:
+                attr = [{"id": pk} for pk in queryset.values_list("pk", flat=True)]
         elif is_manager:
             attr = list(attr.all())
         elif outer_type_ == int and issubclass(type(attr), Model):
@@ -197,6 +350,28 @@ class ModelSchema(BaseModel, metaclass=ModelSchemaMetaclass):
     def from_django(cls, objs, many=False, context={}):
         cls.context = context
         if many:
+            if (
+                isinstance(objs, QuerySet)
+                and objs._result_cache is None
+                # Combined and values() querysets do not support either method
+                and not objs.query.combinator
+                and objs._fields is None
+            ):
+                # Deferred relations cannot be traversed using select_related
+                select_related = [
+                    lookup
+                    for lookup in (
+                        get_loaded_lookup(objs, lookup)
+                        for lookup in cls.__select_related__
+                    )
+                    if lookup is not None
+                ]
+                if select_related:
+                    # Join nested single-valued relations and double underscore aliases
+                    objs = objs.select_related(*select_related)
+                if cls.__prefetch_related__:
+                    # Load many-valued relations in one query each, not per object
+                    objs = objs.prefetch_related(*cls.__prefetch_related__)
             result_objs = []
             for obj in objs:
                 cls.instance = obj
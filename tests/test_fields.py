@@ -39,7 +39,6 @@ def test_unhandled_field_type():
     }
 
 
-@pytest.mark.django_db
 def test_custom_field():
     """
     Test a model using custom field subclasses.
@@ -76,7 +75,6 @@ def test_custom_field():
     }
 
 
-@pytest.mark.django_db
 def test_postgres_json_field():
     """
     Test generating a schema for multiple Postgres JSON fields.
@@ -123,7 +121,6 @@ def test_postgres_json_field():
     }
 
 
-@pytest.mark.django_db
 def test_lazy_choice_field():
     """
     Test generating a dynamic enum choice field.
@@ -246,7 +243,6 @@ def test_enum_choices():
     }
 
 
-@pytest.mark.django_db
 def test_enum_choices_generates_unique_enums():
     class PreferenceSchema(ModelSchema):
         class Config:
@@ -263,7 +259,6 @@ def test_enum_choices_generates_unique_enums():
     )
 
 
-@pytest.mark.django_db
 def test_listing():
     class ListingSchema(ModelSchema):
         class Config:
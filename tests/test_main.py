@@ -5,7 +5,6 @@ from testapp.models import User
 from djantic import ModelSchema
 
 
-@pytest.mark.django_db
 def test_config_errors():
     """
     Test the model config error exceptions.
@@ -38,7 +37,6 @@ def test_config_errors():
                 exclude = ["first_name"]
 
 
-@pytest.mark.django_db
 def test_get_field_names():
     """
     Test retrieving the field names for a model.
@@ -1,7 +1,21 @@
-from typing import List
+import datetime
+from typing import List, Optional
 
 import pytest
-from testapp.models import Bookmark, Message, Profile, Tagged, Thread, User
+from django.contrib.contenttypes.models import ContentType
+from testapp.models import (
+    Article,
+    Bookmark,
+    Child,
+    Message,
+    Parent,
+    Profile,
+    Publication,
+    Tagged,
+    Thread,
+    User,
+)
+from testapp.order import Order, OrderItem, OrderItemDetail, OrderUser
 
 from djantic import ModelSchema
 
@@ -59,7 +73,7 @@ def test_get_instance_with_generic_foreign_key():
 
 
 @pytest.mark.django_db
-def test_get_queryset_with_reverse_one_to_one():
+def test_get_queryset_with_reverse_one_to_one(django_assert_num_queries):
     """
     Test retrieving a Django queryset with reverse one-to-one relationships.
     """
@@ -104,7 +118,11 @@ def test_get_queryset_with_reverse_one_to_one():
 
     users = User.objects.all()
 
-    user_with_profile_schema_qs = UserWithProfileSchema.from_django(users, many=True)
+    # The nested relation is joined rather than queried for every user
+    with django_assert_num_queries(1):
+        user_with_profile_schema_qs = UserWithProfileSchema.from_django(
+            users, many=True
+        )
     assert user_with_profile_schema_qs == [
         {
             "email": "jordan@eremieff.com",
@@ -122,7 +140,7 @@ def test_get_queryset_with_reverse_one_to_one():
 
 
 @pytest.mark.django_db
-def test_get_queryset_with_foreign_key():
+def test_get_queryset_with_foreign_key(django_assert_num_queries):
     """
     Test retrieving a Django queryset with foreign-key relationships.
     """
@@ -141,6 +159,13 @@ def test_get_queryset_with_foreign_key():
     schema = MessageSchema.from_django(message_one)
     assert schema.dict() == {"id": 5, "content": "lol", "thread": 1}
 
+    # The stored foreign key is used without loading the related thread
+    with django_assert_num_queries(1):
+        message_schema_qs = MessageSchema.from_django(
+            Message.objects.order_by("id"), many=True
+        )
+    assert [message.thread for message in message_schema_qs] == [1, 2, 1, 2, 1, 2]
+
     class ThreadSchema(ModelSchema):
         class Config:
             model = Thread
@@ -166,7 +191,7 @@ def test_get_queryset_with_foreign_key():
 
 
 @pytest.mark.django_db
-def test_get_queryset_with_reverse_foreign_key():
+def test_get_queryset_with_reverse_foreign_key(django_assert_num_queries):
     """
     Test retrieving a Django queryset with reverse foreign-key relationships.
     """
@@ -188,7 +213,9 @@ def test_get_queryset_with_reverse_foreign_key():
         class Config:
             model = Thread
 
-    thread_schema_qs = ThreadSchema.from_django(threads, many=True)
+    # The reverse relation is prefetched rather than queried for every thread
+    with django_assert_num_queries(2):
+        thread_schema_qs = ThreadSchema.from_django(threads, many=True)
     thread_schemas = [t.dict() for t in thread_schema_qs]
     assert thread_schemas == [
         {
@@ -211,9 +238,10 @@ def test_get_queryset_with_reverse_foreign_key():
             model = Thread
             exclude = ["created_at", "updated_at"]
 
-    thread_with_message_list_schema_qs = ThreadWithMessageListSchema.from_django(
-        threads, many=True
-    )
+    with django_assert_num_queries(2):
+        thread_with_message_list_schema_qs = ThreadWithMessageListSchema.from_django(
+            threads, many=True
+        )
 
     assert thread_with_message_list_schema_qs == [
         {
@@ -237,6 +265,221 @@ def test_get_queryset_with_reverse_foreign_key():
     ]
 
 
+@pytest.mark.django_db
+def test_get_queryset_with_nested_m2m(django_assert_num_queries):
+    """
+    Test retrieving a Django queryset with relations declared by a nested schema.
+    """
+
+    publication = Publication.objects.create(title="My Publication")
+    for headline in ("First", "Second"):
+        article = Article.objects.create(
+            headline=headline, pub_date=datetime.date(2021, 3, 20)
+        )
+        article.publications.add(publication)
+
+    class PublicationSchema(ModelSchema):
+        class Config:
+            model = Publication
+
+    class ArticleWithPublicationListSchema(ModelSchema):
+        publications: List[PublicationSchema]
+
+        class Config:
+            model = Article
+            include = ["id", "headline", "publications"]
+
+    # One query for the articles and one per prefetched relation
+    with django_assert_num_queries(3):
+        article_schema_qs = ArticleWithPublicationListSchema.from_django(
+            Article.objects.all(), many=True
+        )
+    publication_dict = {
+        "article_set": [{"id": 1}, {"id": 2}],
+        "id": 1,
+        "title": "My Publication",
+    }
+    assert article_schema_qs == [
+        {"id": 1, "headline": "First", "publications": [publication_dict]},
+        {"id": 2, "headline": "Second", "publications": [publication_dict]},
+    ]
+
+
+@pytest.mark.django_db
+def test_get_queryset_with_nested_foreign_key(django_assert_num_queries):
+    """
+    Test retrieving a Django queryset with foreign keys of many related objects.
+    """
+
+    for slug in ("django", "pydantic", "djantic"):
+        bookmark = Bookmark.objects.create(url=f"https://github.com/{slug}")
+        Tagged.objects.create(content_object=bookmark, slug=slug)
+
+    class ContentTypeSchema(ModelSchema):
+        class Config:
+            model = ContentType
+            include = ["app_label", "model"]
+
+    class TaggedSchema(ModelSchema):
+        content_type: ContentTypeSchema
+
+        class Config:
+            model = Tagged
+            include = ["slug", "content_type"]
+
+    class BookmarkWithTaggedSchema(ModelSchema):
+        tags: List[TaggedSchema]
+
+        class Config:
+            model = Bookmark
+            include = ["id", "tags"]
+
+    # One query each for the bookmarks, their tags and the tags' content types
+    with django_assert_num_queries(3):
+        bookmark_schema_qs = BookmarkWithTaggedSchema.from_django(
+            Bookmark.objects.order_by("id"), many=True
+        )
+    content_type_dict = {"app_label": "testapp", "model": "bookmark"}
+    assert bookmark_schema_qs == [
+        {"id": 1, "tags": [{"slug": "django", "content_type": content_type_dict}]},
+        {"id": 2, "tags": [{"slug": "pydantic", "content_type": content_type_dict}]},
+        {"id": 3, "tags": [{"slug": "djantic", "content_type": content_type_dict}]},
+    ]
+
+
+@pytest.mark.django_db
+def test_get_queryset_with_related_query_name(django_assert_num_queries):
+    """
+    Test retrieving a Django queryset with a reverse relation named by its query name.
+    """
+
+    parent = Parent.objects.create(name="Jack")
+    Child.objects.create(name="Jill", parent=parent)
+
+    class ParentSchema(ModelSchema):
+        class Config:
+            model = Parent
+
+    with django_assert_num_queries(1):
+        parent_schema_qs = ParentSchema.from_django(Parent.objects.all(), many=True)
+    assert parent_schema_qs == [{"kid_set": None, "id": 1, "name": "Jack"}]
+
+
+@pytest.mark.django_db
+def test_get_combined_and_values_queryset():
+    """
+    Test retrieving Django querysets that do not support loading relations.
+    """
+
+    thread = Thread.objects.create(title="My thread topic")
+    thread2 = Thread.objects.create(title="Another topic")
+    Message.objects.create(content="I agree.", thread=thread)
+    Message.objects.create(content="lol", thread=thread2)
+
+    class ThreadSchema(ModelSchema):
+        class Config:
+            model = Thread
+            include = ["id", "title", "messages"]
+
+    threads = (
+        Thread.objects.filter(id=thread.id)
+        .order_by()
+        .union(Thread.objects.filter(id=thread2.id).order_by())
+        .order_by("id")
+    )
+    thread_schema_qs = ThreadSchema.from_django(threads, many=True)
+    assert thread_schema_qs == [
+        {"id": 1, "title": "My thread topic", "messages": [{"id": 1}]},
+        {"id": 2, "title": "Another topic", "messages": [{"id": 2}]},
+    ]
+
+    class MessageSchema(ModelSchema):
+        thread: Optional[ThreadSchema]
+
+        class Config:
+            model = Message
+            include = ["id", "thread"]
+
+    # Rows of a values() queryset are dictionaries, not model instances, so the
+    # queryset is not supported but is left as given rather than raising
+    message_schema_qs = MessageSchema.from_django(
+        Message.objects.values("id"), many=True
+    )
+    assert message_schema_qs == [{"id": None, "thread": None}] * 2
+
+
+@pytest.mark.django_db
+def test_get_queryset_with_deferred_foreign_key():
+    """
+    Test retrieving a Django queryset that defers a nested foreign-key relation.
+    """
+
+    thread = Thread.objects.create(title="My thread topic")
+    Message.objects.create(content="I agree.", thread=thread)
+    Message.objects.create(content="lol", thread=thread)
+
+    class ThreadSchema(ModelSchema):
+        class Config:
+            model = Thread
+            include = ["id", "title"]
+
+    class MessageWithThreadSchema(ModelSchema):
+        thread: ThreadSchema
+
+        class Config:
+            model = Message
+            include = ["id", "content", "thread"]
+
+    thread_dict = {"id": 1, "title": "My thread topic"}
+    expected = [
+        {"id": 1, "content": "I agree.", "thread": thread_dict},
+        {"id": 2, "content": "lol", "thread": thread_dict},
+    ]
+    messages = Message.objects.order_by("id")
+    for queryset in (messages.only("id", "content"), messages.defer("thread")):
+        message_schema_qs = MessageWithThreadSchema.from_django(queryset, many=True)
+        assert message_schema_qs == expected
+
+    user = OrderUser.objects.create(first_name="Jack", email="jack@example.com")
+    order = Order.objects.create(shipping_address="Europe", user=user)
+    order_item = OrderItem.objects.create(name="Book", order=order)
+    OrderItemDetail.objects.create(name="Cover", order_item=order_item)
+
+    class OrderSchema(ModelSchema):
+        class Config:
+            model = Order
+            include = ["id", "shipping_address"]
+
+    class OrderItemSchema(ModelSchema):
+        order: OrderSchema
+
+        class Config:
+            model = OrderItem
+            include = ["id", "name", "order"]
+
+    class OrderItemDetailSchema(ModelSchema):
+        order_item: OrderItemSchema
+
+        class Config:
+            model = OrderItemDetail
+            include = ["id", "name", "order_item"]
+
+    # The join stops at the first relation that is not loaded
+    details = OrderItemDetail.objects.only("id", "order_item__id")
+    detail_schema_qs = OrderItemDetailSchema.from_django(details, many=True)
+    assert detail_schema_qs == [
+        {
+            "id": 1,
+            "name": "Cover",
+            "order_item": {
+                "id": 1,
+                "name": "Book",
+                "order": {"id": 1, "shipping_address": "Europe"},
+            },
+        }
+    ]
+
+
 @pytest.mark.django_db
 def test_get_queryset_with_generic_foreign_key():
 
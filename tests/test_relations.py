@@ -1,7 +1,8 @@
 import datetime
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 import pytest
+from django.db.models import prefetch_related_objects
 from pydantic import Field
 from testapp.models import (
     Article,
@@ -16,113 +17,240 @@ from testapp.models import (
     Thread,
     User
 )
+from testapp.order import Order, OrderItem, OrderUser
 
 from djantic import ModelSchema
 
+ID_PROPERTY = {"title": "Id", "description": "id", "type": "integer"}
 
-@pytest.mark.django_db
-def test_m2m():
-    """
-    Test forward m2m relationships.
-    """
+# Relations without a declared sub-model are represented as a list of `{"id": pk}`
+RELATED_ID_ITEMS = {"type": "object", "additionalProperties": {"type": "integer"}}
 
-    class ArticleSchema(ModelSchema):
-        class Config:
-            model = Article
-
-    assert ArticleSchema.schema() == {
-        "title": "ArticleSchema",
-        "description": "A news article.",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "headline": {
-                "title": "Headline",
-                "description": "headline",
-                "maxLength": 100,
-                "type": "string",
-            },
-            "pub_date": {
-                "title": "Pub Date",
-                "description": "pub_date",
-                "type": "string",
-                "format": "date",
-            },
-            "publications": {
-                "title": "Publications",
-                "description": "id",
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "additionalProperties": {"type": "integer"},
-                },
-            },
-        },
-        "required": ["headline", "pub_date", "publications"],
-    }
 
-    class PublicationSchema(ModelSchema):
-        class Config:
-            model = Publication
+class ArticleSchema(ModelSchema):
+    class Config:
+        model = Article
 
-    class ArticleWithPublicationListSchema(ModelSchema):
-        publications: List[PublicationSchema]
 
-        class Config:
-            model = Article
-
-    assert ArticleWithPublicationListSchema.schema() == {
-        "title": "ArticleWithPublicationListSchema",
-        "description": "A news article.",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "headline": {
-                "title": "Headline",
-                "description": "headline",
-                "maxLength": 100,
-                "type": "string",
-            },
-            "pub_date": {
-                "title": "Pub Date",
-                "description": "pub_date",
-                "type": "string",
-                "format": "date",
-            },
-            "publications": {
-                "title": "Publications",
-                "type": "array",
-                "items": {"$ref": "#/definitions/PublicationSchema"},
-            },
+class PublicationSchema(ModelSchema):
+    class Config:
+        model = Publication
+
+
+class ArticleWithPublicationListSchema(ModelSchema):
+    publications: List[PublicationSchema]
+
+    class Config:
+        model = Article
+
+
+class ThreadSchema(ModelSchema):
+    class Config:
+        model = Thread
+
+
+class MessageSchema(ModelSchema):
+    class Config:
+        model = Message
+
+
+class MessageWithThreadSchema(ModelSchema):
+    thread: ThreadSchema
+
+    class Config:
+        model = Message
+
+
+class ThreadWithMessageListSchema(ModelSchema):
+    messages: List[MessageSchema]
+
+    class Config:
+        model = Thread
+
+
+class UserSchema(ModelSchema):
+    class Config:
+        model = User
+
+
+class ProfileSchema(ModelSchema):
+    class Config:
+        model = Profile
+
+
+class ProfileWithUserSchema(ModelSchema):
+    user: UserSchema
+
+    class Config:
+        model = Profile
+
+
+class UserWithProfileSchema(ModelSchema):
+    profile: ProfileSchema
+
+    class Config:
+        model = User
+
+
+class ProfileWithAliasSchema(ModelSchema):
+    first_name: str = Field(alias="user__first_name")
+
+    class Config:
+        model = Profile
+
+
+class TaggedSchema(ModelSchema):
+    class Config:
+        model = Tagged
+
+
+class BookmarkSchema(ModelSchema):
+    class Config:
+        model = Bookmark
+
+
+class BookmarkWithTaggedSchema(ModelSchema):
+    tags: List[TaggedSchema]
+
+    class Config:
+        model = Bookmark
+
+
+class ItemSchema(ModelSchema):
+    tags: List[TaggedSchema]
+
+    class Config:
+        model = Item
+
+
+class ExpertSchema(ModelSchema):
+    class Config:
+        model = Expert
+
+
+class CaseSchema(ModelSchema):
+    class Config:
+        model = Case
+
+
+class CustomExpertSchema(ModelSchema):
+    """Custom schema"""
+
+    name: Optional[str]
+
+    class Config:
+        model = Expert
+
+
+class CaseWithExpertListSchema(ModelSchema):
+    related_experts: List[CustomExpertSchema]
+
+    class Config:
+        model = Case
+
+
+ARTICLE_SCHEMA = {
+    "title": "ArticleSchema",
+    "description": "A news article.",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "headline": {
+            "title": "Headline",
+            "description": "headline",
+            "maxLength": 100,
+            "type": "string",
         },
-        "required": ["headline", "pub_date", "publications"],
-        "definitions": {
-            "PublicationSchema": {
-                "title": "PublicationSchema",
-                "description": "A news publication.",
-                "type": "object",
-                "properties": {
-                    "article_set": {
-                        "title": "Article Set",
-                        "description": "id",
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "additionalProperties": {"type": "integer"},
-                        },
-                    },
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "title": {
-                        "title": "Title",
-                        "description": "title",
-                        "maxLength": 30,
-                        "type": "string",
-                    },
-                },
-                "required": ["title"],
-            }
+        "pub_date": {
+            "title": "Pub Date",
+            "description": "pub_date",
+            "type": "string",
+            "format": "date",
         },
-    }
+        "publications": {
+            "title": "Publications",
+            "description": "id",
+            "type": "array",
+            "items": RELATED_ID_ITEMS,
+        },
+    },
+    "required": ["headline", "pub_date", "publications"],
+}
+
+
+PUBLICATION_SCHEMA = {
+    "title": "PublicationSchema",
+    "description": "A news publication.",
+    "type": "object",
+    "properties": {
+        "article_set": {
+            "title": "Article Set",
+            "description": "id",
+            "type": "array",
+            "items": RELATED_ID_ITEMS,
+        },
+        "id": ID_PROPERTY,
+        "title": {
+            "title": "Title",
+            "description": "title",
+            "maxLength": 30,
+            "type": "string",
+        },
+    },
+    "required": ["title"],
+}
+
+
+ARTICLE_WITH_PUBLICATION_LIST_SCHEMA = {
+    "title": "ArticleWithPublicationListSchema",
+    "description": "A news article.",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "headline": {
+            "title": "Headline",
+            "description": "headline",
+            "maxLength": 100,
+            "type": "string",
+        },
+        "pub_date": {
+            "title": "Pub Date",
+            "description": "pub_date",
+            "type": "string",
+            "format": "date",
+        },
+        "publications": {
+            "title": "Publications",
+            "type": "array",
+            "items": {"$ref": "#/definitions/PublicationSchema"},
+        },
+    },
+    "required": ["headline", "pub_date", "publications"],
+    "definitions": {"PublicationSchema": PUBLICATION_SCHEMA},
+}
+
+
+@pytest.mark.parametrize(
+    "schema, expected",
+    [
+        (ArticleSchema, ARTICLE_SCHEMA),
+        (PublicationSchema, PUBLICATION_SCHEMA),
+        (ArticleWithPublicationListSchema, ARTICLE_WITH_PUBLICATION_LIST_SCHEMA),
+    ],
+)
+def test_m2m(schema, expected):
+    """
+    Test forward m2m relationships.
+    """
+
+    assert schema.schema() == expected
+
+
+@pytest.mark.django_db
+def test_m2m_from_django(django_assert_num_queries):
+    """
+    Test populating a schema from forward m2m relationships.
+    """
 
     article = Article.objects.create(
         headline="My Headline", pub_date=datetime.date(2021, 3, 20)
@@ -130,7 +258,10 @@ def test_m2m():
     publication = Publication.objects.create(title="My Publication")
     article.publications.add(publication)
 
-    schema = ArticleWithPublicationListSchema.from_django(article)
+    # Prefetched relations are used without issuing further queries
+    prefetch_related_objects([article], "publications__article_set")
+    with django_assert_num_queries(0):
+        schema = ArticleWithPublicationListSchema.from_django(article)
     assert schema.dict() == {
         "id": 1,
         "headline": "My Headline",
@@ -139,634 +270,515 @@ def test_m2m():
     }
 
 
-@pytest.mark.django_db
-def test_foreign_key():
+MESSAGE_SCHEMA = {
+    "title": "MessageSchema",
+    "description": "A message posted in a thread.",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "content": {"title": "Content", "description": "content", "type": "string"},
+        "created_at": {
+            "title": "Created At",
+            "description": "created_at",
+            "type": "string",
+            "format": "date-time",
+        },
+        "thread": {"title": "Thread", "description": "id", "type": "integer"},
+    },
+    "required": ["content", "created_at", "thread"],
+}
+
+
+THREAD_SCHEMA = {
+    "title": "ThreadSchema",
+    "description": "A thread of messages.",
+    "type": "object",
+    "properties": {
+        "messages": {
+            "title": "Messages",
+            "description": "id",
+            "type": "array",
+            "items": RELATED_ID_ITEMS,
+        },
+        "id": ID_PROPERTY,
+        "title": {
+            "title": "Title",
+            "description": "title",
+            "maxLength": 30,
+            "type": "string",
+        },
+    },
+    "required": ["title"],
+}
+
+
+MESSAGE_WITH_THREAD_SCHEMA = {
+    "title": "MessageWithThreadSchema",
+    "description": "A message posted in a thread.",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "content": {"title": "Content", "description": "content", "type": "string"},
+        "created_at": {
+            "title": "Created At",
+            "description": "created_at",
+            "type": "string",
+            "format": "date-time",
+        },
+        "thread": {"$ref": "#/definitions/ThreadSchema"},
+    },
+    "required": ["content", "created_at", "thread"],
+    "definitions": {"ThreadSchema": THREAD_SCHEMA},
+}
+
+
+THREAD_WITH_MESSAGE_LIST_SCHEMA = {
+    "title": "ThreadWithMessageListSchema",
+    "description": "A thread of messages.",
+    "type": "object",
+    "properties": {
+        "messages": {
+            "title": "Messages",
+            "type": "array",
+            "items": {"$ref": "#/definitions/MessageSchema"},
+        },
+        "id": ID_PROPERTY,
+        "title": {
+            "title": "Title",
+            "description": "title",
+            "maxLength": 30,
+            "type": "string",
+        },
+    },
+    "required": ["messages", "title"],
+    "definitions": {"MessageSchema": MESSAGE_SCHEMA},
+}
+
+
+@pytest.mark.parametrize(
+    "schema, expected",
+    [
+        (ThreadSchema, THREAD_SCHEMA),
+        (MessageSchema, MESSAGE_SCHEMA),
+        (MessageWithThreadSchema, MESSAGE_WITH_THREAD_SCHEMA),
+        (ThreadWithMessageListSchema, THREAD_WITH_MESSAGE_LIST_SCHEMA),
+    ],
+)
+def test_foreign_key(schema, expected):
     """
     Test forward foreign-key relationships.
     """
 
-    class ThreadSchema(ModelSchema):
-        class Config:
-            model = Thread
-
-    class MessageSchema(ModelSchema):
-        class Config:
-            model = Message
-
-    assert MessageSchema.schema() == {
-        "title": "MessageSchema",
-        "description": "A message posted in a thread.",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "content": {"title": "Content", "description": "content", "type": "string"},
-            "created_at": {
-                "title": "Created At",
-                "description": "created_at",
-                "type": "string",
-                "format": "date-time",
-            },
-            "thread": {"title": "Thread", "description": "id", "type": "integer"},
+    assert schema.schema() == expected
+
+
+PROFILE_SCHEMA = {
+    "title": "ProfileSchema",
+    "description": "A user's profile.",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "user": {"title": "User", "description": "id", "type": "integer"},
+        "website": {
+            "title": "Website",
+            "description": "website",
+            "default": "",
+            "maxLength": 200,
+            "type": "string",
         },
-        "required": ["content", "created_at", "thread"],
-    }
-
-    class MessageWithThreadSchema(ModelSchema):
-
-        thread: ThreadSchema
-
-        class Config:
-            model = Message
-
-    assert MessageWithThreadSchema.schema() == {
-        "title": "MessageWithThreadSchema",
-        "description": "A message posted in a thread.",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "content": {"title": "Content", "description": "content", "type": "string"},
-            "created_at": {
-                "title": "Created At",
-                "description": "created_at",
-                "type": "string",
-                "format": "date-time",
-            },
-            "thread": {"$ref": "#/definitions/ThreadSchema"},
-        },
-        "required": ["content", "created_at", "thread"],
-        "definitions": {
-            "ThreadSchema": {
-                "title": "ThreadSchema",
-                "description": "A thread of messages.",
-                "type": "object",
-                "properties": {
-                    "messages": {
-                        "title": "Messages",
-                        "description": "id",
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "additionalProperties": {"type": "integer"},
-                        },
-                    },
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "title": {
-                        "title": "Title",
-                        "description": "title",
-                        "maxLength": 30,
-                        "type": "string",
-                    },
-                },
-                "required": ["title"],
-            }
+        "location": {
+            "title": "Location",
+            "description": "location",
+            "default": "",
+            "maxLength": 100,
+            "type": "string",
         },
-    }
-
-    class ThreadWithMessageListSchema(ModelSchema):
-        messages: List[MessageSchema]
-
-        class Config:
-            model = Thread
-
-    assert ThreadWithMessageListSchema.schema() == {
-        "title": "ThreadWithMessageListSchema",
-        "description": "A thread of messages.",
-        "type": "object",
-        "properties": {
-            "messages": {
-                "title": "Messages",
-                "type": "array",
-                "items": {"$ref": "#/definitions/MessageSchema"},
-            },
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "title": {
-                "title": "Title",
-                "description": "title",
-                "maxLength": 30,
-                "type": "string",
-            },
+    },
+    "required": ["user"],
+}
+
+
+USER_SCHEMA = {
+    "title": "UserSchema",
+    "description": "A user of the application.",
+    "type": "object",
+    "properties": {
+        "profile": {
+            "title": "Profile",
+            "description": "id",
+            "type": "integer",
         },
-        "required": ["messages", "title"],
-        "definitions": {
-            "MessageSchema": {
-                "title": "MessageSchema",
-                "description": "A message posted in a thread.",
-                "type": "object",
-                "properties": {
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "content": {
-                        "title": "Content",
-                        "description": "content",
-                        "type": "string",
-                    },
-                    "created_at": {
-                        "title": "Created At",
-                        "description": "created_at",
-                        "type": "string",
-                        "format": "date-time",
-                    },
-                    "thread": {
-                        "title": "Thread",
-                        "description": "id",
-                        "type": "integer",
-                    },
-                },
-                "required": ["content", "created_at", "thread"],
-            }
+        "id": ID_PROPERTY,
+        "first_name": {
+            "title": "First Name",
+            "description": "first_name",
+            "maxLength": 50,
+            "type": "string",
         },
-    }
-
-
-@pytest.mark.django_db
-def test_one_to_one():
+        "last_name": {
+            "title": "Last Name",
+            "description": "last_name",
+            "maxLength": 50,
+            "type": "string",
+        },
+        "email": {
+            "title": "Email",
+            "description": "email",
+            "maxLength": 254,
+            "type": "string",
+        },
+        "created_at": {
+            "title": "Created At",
+            "description": "created_at",
+            "type": "string",
+            "format": "date-time",
+        },
+        "updated_at": {
+            "title": "Updated At",
+            "description": "updated_at",
+            "type": "string",
+            "format": "date-time",
+        },
+    },
+    "required": ["first_name", "email", "created_at", "updated_at"],
+}
+
+
+PROFILE_WITH_USER_SCHEMA = {
+    "title": "ProfileWithUserSchema",
+    "description": "A user's profile.",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "user": {"$ref": "#/definitions/UserSchema"},
+        "website": {
+            "title": "Website",
+            "description": "website",
+            "default": "",
+            "maxLength": 200,
+            "type": "string",
+        },
+        "location": {
+            "title": "Location",
+            "description": "location",
+            "default": "",
+            "maxLength": 100,
+            "type": "string",
+        },
+    },
+    "required": ["user"],
+    "definitions": {"UserSchema": USER_SCHEMA},
+}
+
+
+@pytest.mark.parametrize(
+    "schema, expected",
+    [
+        (UserSchema, USER_SCHEMA),
+        (ProfileSchema, PROFILE_SCHEMA),
+        (ProfileWithUserSchema, PROFILE_WITH_USER_SCHEMA),
+    ],
+)
+def test_one_to_one(schema, expected):
     """
     Test forward one-to-one relationships.
     """
 
-    class UserSchema(ModelSchema):
-        class Config:
-            model = User
-
-    class ProfileSchema(ModelSchema):
-        class Config:
-            model = Profile
-
-    assert ProfileSchema.schema() == {
-        "title": "ProfileSchema",
-        "description": "A user's profile.",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "user": {"title": "User", "description": "id", "type": "integer"},
-            "website": {
-                "title": "Website",
-                "description": "website",
-                "default": "",
-                "maxLength": 200,
-                "type": "string",
-            },
-            "location": {
-                "title": "Location",
-                "description": "location",
-                "default": "",
-                "maxLength": 100,
-                "type": "string",
-            },
+    assert schema.schema() == expected
+
+
+USER_WITH_PROFILE_SCHEMA = {
+    "title": "UserWithProfileSchema",
+    "description": "A user of the application.",
+    "type": "object",
+    "properties": {
+        "profile": {"$ref": "#/definitions/ProfileSchema"},
+        "id": ID_PROPERTY,
+        "first_name": {
+            "title": "First Name",
+            "description": "first_name",
+            "maxLength": 50,
+            "type": "string",
         },
-        "required": ["user"],
-    }
-
-    class ProfileWithUserSchema(ModelSchema):
-        user: UserSchema
-
-        class Config:
-            model = Profile
-
-    assert ProfileWithUserSchema.schema() == {
-        "title": "ProfileWithUserSchema",
-        "description": "A user's profile.",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "user": {"$ref": "#/definitions/UserSchema"},
-            "website": {
-                "title": "Website",
-                "description": "website",
-                "default": "",
-                "maxLength": 200,
-                "type": "string",
-            },
-            "location": {
-                "title": "Location",
-                "description": "location",
-                "default": "",
-                "maxLength": 100,
-                "type": "string",
-            },
+        "last_name": {
+            "title": "Last Name",
+            "description": "last_name",
+            "maxLength": 50,
+            "type": "string",
         },
-        "required": ["user"],
-        "definitions": {
-            "UserSchema": {
-                "title": "UserSchema",
-                "description": "A user of the application.",
-                "type": "object",
-                "properties": {
-                    "profile": {
-                        "title": "Profile",
-                        "description": "id",
-                        "type": "integer",
-                    },
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "first_name": {
-                        "title": "First Name",
-                        "description": "first_name",
-                        "maxLength": 50,
-                        "type": "string",
-                    },
-                    "last_name": {
-                        "title": "Last Name",
-                        "description": "last_name",
-                        "maxLength": 50,
-                        "type": "string",
-                    },
-                    "email": {
-                        "title": "Email",
-                        "description": "email",
-                        "maxLength": 254,
-                        "type": "string",
-                    },
-                    "created_at": {
-                        "title": "Created At",
-                        "description": "created_at",
-                        "type": "string",
-                        "format": "date-time",
-                    },
-                    "updated_at": {
-                        "title": "Updated At",
-                        "description": "updated_at",
-                        "type": "string",
-                        "format": "date-time",
-                    },
-                },
-                "required": ["first_name", "email", "created_at", "updated_at"],
-            }
+        "email": {
+            "title": "Email",
+            "description": "email",
+            "maxLength": 254,
+            "type": "string",
         },
-    }
-
-
-@pytest.mark.django_db
-def test_one_to_one_reverse():
+        "created_at": {
+            "title": "Created At",
+            "description": "created_at",
+            "type": "string",
+            "format": "date-time",
+        },
+        "updated_at": {
+            "title": "Updated At",
+            "description": "updated_at",
+            "type": "string",
+            "format": "date-time",
+        },
+    },
+    "required": ["profile", "first_name", "email", "created_at", "updated_at"],
+    "definitions": {"ProfileSchema": PROFILE_SCHEMA},
+}
+
+
+@pytest.mark.parametrize(
+    "schema, expected",
+    [
+        (ProfileSchema, PROFILE_SCHEMA),
+        (UserWithProfileSchema, USER_WITH_PROFILE_SCHEMA),
+    ],
+)
+def test_one_to_one_reverse(schema, expected):
     """
     Test reverse one-to-one relationships.
     """
 
-    class ProfileSchema(ModelSchema):
-        class Config:
-            model = Profile
+    assert schema.schema() == expected
 
-    class UserSchema(ModelSchema):
-        class Config:
-            model = User
-
-    assert ProfileSchema.schema() == {
-        "title": "ProfileSchema",
-        "description": "A user's profile.",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "user": {"title": "User", "description": "id", "type": "integer"},
-            "website": {
-                "title": "Website",
-                "description": "website",
-                "default": "",
-                "maxLength": 200,
-                "type": "string",
-            },
-            "location": {
-                "title": "Location",
-                "description": "location",
-                "default": "",
-                "maxLength": 100,
-                "type": "string",
-            },
-        },
-        "required": ["user"],
-    }
 
-    class UserWithProfileSchema(ModelSchema):
-        profile: ProfileSchema
-
-        class Config:
-            model = User
-
-    assert UserWithProfileSchema.schema() == {
-        "title": "UserWithProfileSchema",
-        "description": "A user of the application.",
-        "type": "object",
-        "properties": {
-            "profile": {"$ref": "#/definitions/ProfileSchema"},
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "first_name": {
-                "title": "First Name",
-                "description": "first_name",
-                "maxLength": 50,
-                "type": "string",
-            },
-            "last_name": {
-                "title": "Last Name",
-                "description": "last_name",
-                "maxLength": 50,
-                "type": "string",
-            },
-            "email": {
-                "title": "Email",
-                "description": "email",
-                "maxLength": 254,
-                "type": "string",
-            },
-            "created_at": {
-                "title": "Created At",
-                "description": "created_at",
-                "type": "string",
-                "format": "date-time",
-            },
-            "updated_at": {
-                "title": "Updated At",
-                "description": "updated_at",
-                "type": "string",
-                "format": "date-time",
-            },
+TAGGED_SCHEMA = {
+    "title": "TaggedSchema",
+    "description": "Tagged(id, slug, content_type, object_id)",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "slug": {
+            "title": "Slug",
+            "description": "slug",
+            "maxLength": 50,
+            "type": "string",
         },
-        "required": ["profile", "first_name", "email", "created_at", "updated_at"],
-        "definitions": {
-            "ProfileSchema": {
-                "title": "ProfileSchema",
-                "description": "A user's profile.",
-                "type": "object",
-                "properties": {
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "user": {"title": "User", "description": "id", "type": "integer"},
-                    "website": {
-                        "title": "Website",
-                        "description": "website",
-                        "default": "",
-                        "maxLength": 200,
-                        "type": "string",
-                    },
-                    "location": {
-                        "title": "Location",
-                        "description": "location",
-                        "default": "",
-                        "maxLength": 100,
-                        "type": "string",
-                    },
-                },
-                "required": ["user"],
-            }
+        "content_type": {
+            "title": "Content Type",
+            "description": "id",
+            "type": "integer",
         },
-    }
-
-
-@pytest.mark.django_db
-def test_generic_relation():
+        "object_id": {
+            "title": "Object Id",
+            "description": "object_id",
+            "type": "integer",
+        },
+        "content_object": {
+            "title": "Content Object",
+            "description": "content_object",
+            "type": "integer",
+        },
+    },
+    "required": ["slug", "content_type", "object_id", "content_object"],
+}
+
+
+BOOKMARK_SCHEMA = {
+    "title": "BookmarkSchema",
+    "description": "Bookmark(id, url)",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "url": {
+            "title": "Url",
+            "description": "url",
+            "maxLength": 200,
+            "type": "string",
+        },
+        "tags": {
+            "title": "Tags",
+            "description": "id",
+            "type": "array",
+            "items": RELATED_ID_ITEMS,
+        },
+    },
+    "required": ["url"],
+}
+
+
+BOOKMARK_WITH_TAGGED_SCHEMA = {
+    "title": "BookmarkWithTaggedSchema",
+    "description": "Bookmark(id, url)",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "url": {
+            "title": "Url",
+            "description": "url",
+            "maxLength": 200,
+            "type": "string",
+        },
+        "tags": {
+            "title": "Tags",
+            "type": "array",
+            "items": {"$ref": "#/definitions/TaggedSchema"},
+        },
+    },
+    "required": ["url", "tags"],
+    "definitions": {"TaggedSchema": TAGGED_SCHEMA},
+}
+
+
+ITEM_SCHEMA = {
+    "title": "ItemSchema",
+    "description": "Item(id, name, item_list)",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "name": {
+            "title": "Name",
+            "description": "name",
+            "maxLength": 100,
+            "type": "string",
+        },
+        "item_list": {
+            "title": "Item List",
+            "description": "id",
+            "type": "integer",
+        },
+        "tags": {
+            "title": "Tags",
+            "type": "array",
+            "items": {"$ref": "#/definitions/TaggedSchema"},
+        },
+    },
+    "required": ["name", "item_list", "tags"],
+    "definitions": {"TaggedSchema": TAGGED_SCHEMA},
+}
+
+
+@pytest.mark.parametrize(
+    "schema, expected",
+    [
+        (TaggedSchema, TAGGED_SCHEMA),
+        (BookmarkSchema, BOOKMARK_SCHEMA),
+        (BookmarkWithTaggedSchema, BOOKMARK_WITH_TAGGED_SCHEMA),
+        # Test without defining a GenericRelation on the model
+        (ItemSchema, ITEM_SCHEMA),
+    ],
+)
+def test_generic_relation(schema, expected):
     """
     Test generic foreign-key relationships.
     """
 
-    class TaggedSchema(ModelSchema):
-        class Config:
-            model = Tagged
+    assert schema.schema() == expected
 
-    assert TaggedSchema.schema() == {
-        "title": "TaggedSchema",
-        "description": "Tagged(id, slug, content_type, object_id)",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "slug": {
-                "title": "Slug",
-                "description": "slug",
-                "maxLength": 50,
-                "type": "string",
-            },
-            "content_type": {
-                "title": "Content Type",
-                "description": "id",
-                "type": "integer",
-            },
-            "object_id": {
-                "title": "Object Id",
-                "description": "object_id",
-                "type": "integer",
-            },
-            "content_object": {
-                "title": "Content Object",
-                "description": "content_object",
-                "type": "integer",
-            },
-        },
-        "required": ["slug", "content_type", "object_id", "content_object"],
-    }
 
-    class BookmarkSchema(ModelSchema):
-        # FIXME: I added this because for some reason in 2.2 the GenericRelation field
-        # ends up required, but in 3 it does not.
-        tags: List[Dict[str, int]] = None
-
-        class Config:
-            model = Bookmark
-
-    assert BookmarkSchema.schema() == {
-        "title": "BookmarkSchema",
-        "description": "Bookmark(id, url)",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "url": {
-                "title": "Url",
-                "description": "url",
-                "maxLength": 200,
-                "type": "string",
-            },
-            "tags": {
-                "title": "Tags",
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "additionalProperties": {"type": "integer"},
-                },
-            },
+EXPERT_SCHEMA = {
+    "title": "ExpertSchema",
+    "description": "Expert(id, name)",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "name": {
+            "title": "Name",
+            "description": "name",
+            "maxLength": 128,
+            "type": "string",
         },
-        "required": ["url"],
-    }
-
-    class BookmarkWithTaggedSchema(ModelSchema):
-
-        tags: List[TaggedSchema]
-
-        class Config:
-            model = Bookmark
-
-    assert BookmarkWithTaggedSchema.schema() == {
-        "title": "BookmarkWithTaggedSchema",
-        "description": "Bookmark(id, url)",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "url": {
-                "title": "Url",
-                "description": "url",
-                "maxLength": 200,
-                "type": "string",
-            },
-            "tags": {
-                "title": "Tags",
-                "type": "array",
-                "items": {"$ref": "#/definitions/TaggedSchema"},
-            },
+        "cases": {
+            "title": "Cases",
+            "description": "id",
+            "type": "array",
+            "items": RELATED_ID_ITEMS,
         },
-        "required": ["url", "tags"],
-        "definitions": {
-            "TaggedSchema": {
-                "title": "TaggedSchema",
-                "description": "Tagged(id, slug, content_type, object_id)",
-                "type": "object",
-                "properties": {
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "slug": {
-                        "title": "Slug",
-                        "description": "slug",
-                        "maxLength": 50,
-                        "type": "string",
-                    },
-                    "content_type": {
-                        "title": "Content Type",
-                        "description": "id",
-                        "type": "integer",
-                    },
-                    "object_id": {
-                        "title": "Object Id",
-                        "description": "object_id",
-                        "type": "integer",
-                    },
-                    "content_object": {
-                        "title": "Content Object",
-                        "description": "content_object",
-                        "type": "integer",
-                    },
-                },
-                "required": ["slug", "content_type", "object_id", "content_object"],
-            }
+    },
+    "required": ["name", "cases"],
+}
+
+
+CASE_SCHEMA = {
+    "title": "CaseSchema",
+    "description": "Case(id, name, details)",
+    "type": "object",
+    "properties": {
+        "related_experts": {
+            "title": "Related Experts",
+            "description": "id",
+            "type": "array",
+            "items": RELATED_ID_ITEMS,
         },
-    }
+        "id": ID_PROPERTY,
+        "name": {
+            "title": "Name",
+            "description": "name",
+            "maxLength": 128,
+            "type": "string",
+        },
+        "details": {"title": "Details", "description": "details", "type": "string"},
+    },
+    "required": ["name", "details"],
+}
+
+
+CASE_WITH_EXPERT_LIST_SCHEMA = {
+    "title": "CaseWithExpertListSchema",
+    "description": "Case(id, name, details)",
+    "type": "object",
+    "properties": {
+        "related_experts": {
+            "title": "Related Experts",
+            "type": "array",
+            "items": {"$ref": "#/definitions/CustomExpertSchema"},
+        },
+        "id": ID_PROPERTY,
+        "name": {
+            "title": "Name",
+            "description": "name",
+            "maxLength": 128,
+            "type": "string",
+        },
+        "details": {"title": "Details", "description": "details", "type": "string"},
+    },
+    "required": ["related_experts", "name", "details"],
+    "definitions": {
+        "CustomExpertSchema": {
+            "title": "CustomExpertSchema",
+            "description": "Custom schema",
+            "type": "object",
+            "properties": {
+                "id": ID_PROPERTY,
+                "name": {"title": "Name", "type": "string"},
+                "cases": {
+                    "title": "Cases",
+                    "description": "id",
+                    "type": "array",
+                    "items": RELATED_ID_ITEMS,
+                },
+            },
+            "required": ["cases"],
+        }
+    },
+}
 
-    class ItemSchema(ModelSchema):
 
-        tags: List[TaggedSchema]
+@pytest.mark.parametrize(
+    "schema, expected",
+    [
+        (ExpertSchema, EXPERT_SCHEMA),
+        (CaseSchema, CASE_SCHEMA),
+        (CaseWithExpertListSchema, CASE_WITH_EXPERT_LIST_SCHEMA),
+    ],
+)
+def test_m2m_reverse(schema, expected):
+    """
+    Test reverse m2m relationships.
+    """
 
-        class Config:
-            model = Item
-
-    # Test without defining a GenericRelation on the model
-    assert ItemSchema.schema() == {
-        "title": "ItemSchema",
-        "description": "Item(id, name, item_list)",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "name": {
-                "title": "Name",
-                "description": "name",
-                "maxLength": 100,
-                "type": "string",
-            },
-            "item_list": {
-                "title": "Item List",
-                "description": "id",
-                "type": "integer",
-            },
-            "tags": {
-                "title": "Tags",
-                "type": "array",
-                "items": {"$ref": "#/definitions/TaggedSchema"},
-            },
-        },
-        "required": ["name", "item_list", "tags"],
-        "definitions": {
-            "TaggedSchema": {
-                "title": "TaggedSchema",
-                "description": "Tagged(id, slug, content_type, object_id)",
-                "type": "object",
-                "properties": {
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "slug": {
-                        "title": "Slug",
-                        "description": "slug",
-                        "maxLength": 50,
-                        "type": "string",
-                    },
-                    "content_type": {
-                        "title": "Content Type",
-                        "description": "id",
-                        "type": "integer",
-                    },
-                    "object_id": {
-                        "title": "Object Id",
-                        "description": "object_id",
-                        "type": "integer",
-                    },
-                    "content_object": {
-                        "title": "Content Object",
-                        "description": "content_object",
-                        "type": "integer",
-                    },
-                },
-                "required": ["slug", "content_type", "object_id", "content_object"],
-            }
-        },
-    }
+    assert schema.schema() == expected
 
 
 @pytest.mark.django_db
-def test_m2m_reverse():
-    class ExpertSchema(ModelSchema):
-        class Config:
-            model = Expert
-
-    class CaseSchema(ModelSchema):
-        class Config:
-            model = Case
-
-    assert ExpertSchema.schema() == {
-        "title": "ExpertSchema",
-        "description": "Expert(id, name)",
-        "type": "object",
-        "properties": {
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "name": {
-                "title": "Name",
-                "description": "name",
-                "maxLength": 128,
-                "type": "string",
-            },
-            "cases": {
-                "title": "Cases",
-                "description": "id",
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "additionalProperties": {"type": "integer"},
-                },
-            },
-        },
-        "required": ["name", "cases"],
-    }
+def test_m2m_reverse_from_django(django_assert_num_queries):
+    """
+    Test populating a schema from reverse m2m relationships.
+    """
 
-    assert CaseSchema.schema() == {
-        "title": "CaseSchema",
-        "description": "Case(id, name, details)",
-        "type": "object",
-        "properties": {
-            "related_experts": {
-                "title": "Related Experts",
-                "description": "id",
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "additionalProperties": {"type": "integer"},
-                },
-            },
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "name": {
-                "title": "Name",
-                "description": "name",
-                "maxLength": 128,
-                "type": "string",
-            },
-            "details": {"title": "Details", "description": "details", "type": "string"},
-        },
-        "required": ["name", "details"],
-    }
     case = Case.objects.create(name="My Case", details="Some text data.")
     expert = Expert.objects.create(name="My Expert")
     case_schema = CaseSchema.from_django(case)
@@ -790,121 +802,138 @@ def test_m2m_reverse():
     }
     assert expert_schema.dict() == {"id": 1, "name": "My Expert", "cases": [{"id": 1}]}
 
-    class CustomExpertSchema(ModelSchema):
-        """Custom schema"""
+    # Prefetched relations are used without issuing further queries
+    case = Case.objects.prefetch_related("related_experts__cases").get(pk=case.pk)
+    with django_assert_num_queries(0):
+        case_schema = CaseWithExpertListSchema.from_django(case)
+    assert case_schema.dict() == {
+        "related_experts": [{"id": 1, "name": "My Expert", "cases": [{"id": 1}]}],
+        "id": 1,
+        "name": "My Case",
+        "details": "Some text data.",
+    }
 
-        name: Optional[str]
 
-        class Config:
-            model = Expert
+PROFILE_WITH_ALIAS_SCHEMA = {
+    "title": "ProfileWithAliasSchema",
+    "description": "A user's profile.",
+    "type": "object",
+    "properties": {
+        "id": ID_PROPERTY,
+        "user": {"title": "User", "description": "id", "type": "integer"},
+        "website": {
+            "title": "Website",
+            "description": "website",
+            "default": "",
+            "maxLength": 200,
+            "type": "string",
+        },
+        "location": {
+            "title": "Location",
+            "description": "location",
+            "default": "",
+            "maxLength": 100,
+            "type": "string",
+        },
+        "user__first_name": {"title": "User  First Name", "type": "string"},
+    },
+    "required": ["user", "user__first_name"],
+}
 
-    class CaseSchema(ModelSchema):
-        related_experts: List[CustomExpertSchema]
 
-        class Config:
-            model = Case
-
-    assert CaseSchema.schema() == {
-        "title": "CaseSchema",
-        "description": "Case(id, name, details)",
-        "type": "object",
-        "properties": {
-            "related_experts": {
-                "title": "Related Experts",
-                "type": "array",
-                "items": {"$ref": "#/definitions/CustomExpertSchema"},
-            },
-            "id": {"title": "Id", "description": "id", "type": "integer"},
-            "name": {
-                "title": "Name",
-                "description": "name",
-                "maxLength": 128,
-                "type": "string",
-            },
-            "details": {"title": "Details", "description": "details", "type": "string"},
-        },
-        "required": ["related_experts", "name", "details"],
-        "definitions": {
-            "CustomExpertSchema": {
-                "title": "CustomExpertSchema",
-                "description": "Custom schema",
-                "type": "object",
-                "properties": {
-                    "id": {"title": "Id", "description": "id", "type": "integer"},
-                    "name": {"title": "Name", "type": "string"},
-                    "cases": {
-                        "title": "Cases",
-                        "description": "id",
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "additionalProperties": {"type": "integer"},
-                        },
-                    },
-                },
-                "required": ["cases"],
-            }
-        },
+@pytest.mark.django_db
+def test_alias(django_assert_num_queries):
+    assert ProfileWithAliasSchema.schema() == PROFILE_WITH_ALIAS_SCHEMA
+
+    user = User.objects.create(first_name="Jack")
+    profile = Profile.objects.create(
+        user=user, website='www.github.com', location='Europe')
+    assert ProfileWithAliasSchema.from_django(profile).dict() == {
+        "first_name": "Jack",
+        "id": 1,
+        "location": "Europe",
+        "user": 1,
+        "website": "www.github.com",
     }
 
-    case_schema = CaseSchema.from_django(case)
-    assert case_schema.dict() == {
-        "related_experts": [{"id": 1, "name": "My Expert", "cases": [{'id': 1}]}],
+    # Relations followed by an alias are joined when loading a queryset
+    profiles = Profile.objects.all()
+    with django_assert_num_queries(1):
+        profile_schemas = ProfileWithAliasSchema.from_django(profiles, many=True)
+    profile_dict = {
+        "first_name": "Jack",
         "id": 1,
-        "name": "My Case",
-        "details": "Some text data.",
+        "location": "Europe",
+        "user": 1,
+        "website": "www.github.com",
     }
+    assert profile_schemas == [profile_dict]
 
+    # Deferred and combined querysets are loaded without the join
+    for queryset in (
+        profiles.only("id", "website"),
+        profiles.filter(id=1).union(profiles.filter(location="Europe")),
+    ):
+        profile_schemas = ProfileWithAliasSchema.from_django(queryset, many=True)
+        assert profile_schemas == [profile_dict]
 
-@pytest.mark.django_db
-def test_alias():
-    class ProfileSchema(ModelSchema):
-        first_name: str = Field(alias='user__first_name')
+    # Only the single-valued relations at the start of an alias are joined
+    class ProfileWithUserAliasSchema(ModelSchema):
+        user_id: int = Field(alias="user_id__real")
+        joined_year: int = Field(alias="user__created_at__year")
 
         class Config:
             model = Profile
+            include = ["id", "user_id", "joined_year"]
 
-    assert ProfileSchema.schema() == {
-        'title': 'ProfileSchema',
-        'description': "A user's profile.",
-        'type': 'object',
-        'properties': {
-            'id': {
-                'title': 'Id',
-                'description': 'id',
-                'type': 'integer'
-            },
-            'user': {
-                'title': 'User',
-                'description': 'id',
-                'type': 'integer'
-            },
-            'website': {
-                'title': 'Website',
-                'description': 'website',
-                'default': '', 'maxLength': 200,
-                'type': 'string'
-            },
-            'location': {
-                'title': 'Location',
-                'description': 'location',
-                'default': '',
-                'maxLength': 100,
-                'type': 'string'
-            },
-            'user__first_name': {
-                'title': 'User  First Name',
-                'type': 'string'
-            }
-        },
-        'required': ['user', 'user__first_name']
-    }
+    assert ProfileWithUserAliasSchema.__select_related__ == ("user",)
+    with django_assert_num_queries(1):
+        profile_schemas = ProfileWithUserAliasSchema.from_django(profiles, many=True)
+    assert profile_schemas == [
+        {"id": 1, "user_id": 1, "joined_year": user.created_at.year}
+    ]
 
-    user = User.objects.create(first_name="Jack")
-    profile = Profile.objects.create(
-        user=user, website='www.github.com', location='Europe')
-    assert ProfileSchema.from_django(profile).dict() == {'first_name': 'Jack',
-                                                         'id': 1,
-                                                         'location': 'Europe',
-                                                         'user': 1,
-                                                         'website': 'www.github.com'}
+    class ThreadWithAliasSchema(ModelSchema):
+        message_count: int = Field(alias="messages__count")
+
+        class Config:
+            model = Thread
+            include = ["id", "message_count"]
+
+    assert ThreadWithAliasSchema.__select_related__ == ()
+
+    class TaggedWithAliasSchema(ModelSchema):
+        url: str = Field(alias="content_object__url")
+
+        class Config:
+            model = Tagged
+            include = ["slug", "url"]
+
+    bookmark = Bookmark.objects.create(url="https://www.djangoproject.com/")
+    Tagged.objects.create(content_object=bookmark, slug="django")
+    assert TaggedWithAliasSchema.__select_related__ == ()
+    tagged_schemas = TaggedWithAliasSchema.from_django(Tagged.objects.all(), many=True)
+    assert tagged_schemas == [{"slug": "django", "url": "https://www.djangoproject.com/"}]
+
+    # Aliases spanning several relations are joined up to the first deferred one
+    class OrderItemWithAliasSchema(ModelSchema):
+        first_name: str = Field(alias="order__user__first_name")
+
+        class Config:
+            model = OrderItem
+            include = ["id", "first_name"]
+
+    order_user = OrderUser.objects.create(first_name="Jill", email="jill@example.com")
+    order = Order.objects.create(shipping_address="Europe", user=order_user)
+    OrderItem.objects.create(name="Book", order=order)
+    assert OrderItemWithAliasSchema.__select_related__ == ("order__user",)
+    order_items = OrderItem.objects.all()
+    with django_assert_num_queries(1):
+        order_item_schemas = OrderItemWithAliasSchema.from_django(
+            order_items, many=True
+        )
+    assert order_item_schemas == [{"id": 1, "first_name": "Jill"}]
+    order_item_schemas = OrderItemWithAliasSchema.from_django(
+        order_items.only("id", "order__id"), many=True
+    )
+    assert order_item_schemas == [{"id": 1, "first_name": "Jill"}]
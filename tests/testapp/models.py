@@ -270,3 +270,14 @@ class Case(ExtendedModel):
 
 class Listing(models.Model):
     items = ArrayField(models.TextField(), size=4)
+
+
+class Parent(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class Child(models.Model):
+    name = models.CharField(max_length=50)
+    parent = models.ForeignKey(
+        Parent, on_delete=models.CASCADE, related_query_name="kid"
+    )